@@ -6,44 +6,157 @@ This demonstrates how to connect to the WebSocket server and send commands
 to control VS Code programmatically from Python.
 
 Requirements:
-    pip install websockets
+    pip install "websockets>=14"
+    pip install orjson  # optional, faster JSON encoding/decoding
+    pip install pysimdjson  # optional, faster decoding of server responses
+    pip install "uvloop>=0.18"  # optional, faster event loop (not available on Windows)
 """
 
 import asyncio
+import contextlib
+import functools
+import itertools
 import json
+import logging
+import os
 import sys
 import time
 import websockets
 import argparse
 
+# Prefer orjson on the send/receive path; fall back to the stdlib json module.
+# Both variants of json_dumps return UTF-8 bytes, which are sent as text frames as-is.
+try:
+    import orjson
+    json_loads = orjson.loads
+    json_dumps = orjson.dumps
+
+    def json_pretty(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode("utf-8")
+except ImportError:
+    json_loads = json.loads
+
+    def json_dumps(obj):
+        return json.dumps(obj).encode("utf-8")
+
+    def json_pretty(obj):
+        return json.dumps(obj, indent=2)
+
+# Responses are decoded with a single long-lived simdjson parser when available,
+# so its internal buffers are reused across frames instead of reallocated.
+try:
+    import simdjson
+    response_parser = simdjson.Parser()
+    response_types = (dict, simdjson.Object)
+except ImportError:
+    response_parser = None
+    response_types = (dict,)
+
+
+def decode_response(message):
+    """Decode a server frame into a mapping
+    
+    With simdjson this is a lazy document: only the fields that are looked
+    up get converted, and it must be dropped before the next frame is parsed.
+    """
+    if response_parser is None:
+        return json_loads(message)
+    return response_parser.parse(message)
+
+
+def to_python(value):
+    """Convert a lazily decoded simdjson value into plain Python objects"""
+    if response_parser is not None:
+        if isinstance(value, simdjson.Object):
+            return value.as_dict()
+        if isinstance(value, simdjson.Array):
+            return value.as_list()
+    return value
+
 # Default configuration
 DEFAULT_PORT = 3000
 DEFAULT_HOST = "localhost"
 
+# Seconds to wait for a response before a request times out
+REQUEST_TIMEOUT = 10
+
+# Longest command line the daemon reads, so large file contents fit
+DAEMON_LINE_LIMIT = 64 * 1024 * 1024
+
+# Results larger than this (in encoded bytes) are printed compactly
+PRETTY_PRINT_LIMIT = 4096
+
+# Only pretty-print results for a terminal, not when output is piped
+PRETTY_OUTPUT = sys.stdout.isatty()
+
 # Command-line arguments
 parser = argparse.ArgumentParser(description="VS Code MCP Client")
 parser.add_argument("--host", default=DEFAULT_HOST, help=f"Host to connect to (default: {DEFAULT_HOST})")
 parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Port to connect to (default: {DEFAULT_PORT})")
+parser.add_argument("--verbose", action="store_true", help="Log command parameters before sending")
+parser.add_argument("--daemon", metavar="SOCKET_PATH", help="Keep one connection open and forward line-delimited JSON commands from a Unix socket")
 args = parser.parse_args()
 
+# Logging setup; --verbose enables the per-command debug output for this
+# script only, not the websockets library's per-frame logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(message)s",
+    stream=sys.stdout
+)
+log = logging.getLogger(__name__)
+if args.verbose:
+    log.setLevel(logging.DEBUG)
+
 # Websocket URL
 WS_URL = f"ws://{args.host}:{args.port}"
 
-# Map to track pending requests
-pending_requests = {}
 
-# Next request ID
-next_id = 1
+def command_template(action):
+    """Build an encoded command with %d/%s holes for the ID and encoded params"""
+    return b'{"id":%d,"action":' + json_dumps(action) + b',"params":%s}'
+
+
+# Pre-encoded command skeletons for the actions the server supports
+COMMAND_TEMPLATES = {
+    action: command_template(action)
+    for action in (
+        "openFile",
+        "createFile",
+        "getFileContent",
+        "saveFile",
+        "closeFile",
+        "type",
+        "runCommand"
+    )
+}
+
 
 class VSCodeMCPClient:
-    def __init__(self, url):
+    def __init__(self, url, interactive=True):
         self.url = url
         self.websocket = None
+        # Print the outcome of each request; scripted callers use the return values
+        self.interactive = interactive
+        # Futures for in-flight requests, keyed by command ID
+        self._pending = {}
+        self._next_id = itertools.count(1).__next__
     
     async def connect(self):
         """Connect to the VS Code MCP Server"""
         try:
-            self.websocket = await websockets.connect(self.url)
+            # The server is trusted local traffic: lift the 1 MiB frame limit so
+            # large getFileContent responses are not rejected. Keepalive pings
+            # detect a dead connection early; closing should not linger.
+            # Compression only costs CPU on a localhost connection.
+            self.websocket = await websockets.connect(
+                self.url,
+                compression=None,
+                max_size=None,
+                ping_interval=20,
+                ping_timeout=20,
+                close_timeout=1
+            )
             print(f"Connected to VS Code MCP Server at {self.url}")
             return True
         except Exception as e:
@@ -56,85 +169,175 @@ class VSCodeMCPClient:
             await self.websocket.close()
             print("Disconnected from VS Code MCP Server")
     
-    async def send_command(self, action, params=None, description=None):
-        """Send a command to the VS Code MCP server"""
-        global next_id
-        
+    def _expire_request(self, command_id):
+        """Fail a request whose response did not arrive in time"""
+        future = self._pending.pop(command_id, None)
+        if future is not None and not future.done():
+            future.set_exception(asyncio.TimeoutError("Timeout waiting for response"))
+    
+    def _start_timer(self, command_id):
+        """Start the response timeout for a request once it has been sent"""
+        return asyncio.get_running_loop().call_later(
+            REQUEST_TIMEOUT, self._expire_request, command_id
+        )
+    
+    def _prepare_command(self, action, params=None, description=None):
+        """Register a pending request and return its ID, payload and future"""
         if params is None:
             params = {}
         
-        if description is None:
-            description = action
-        
-        command_id = next_id
-        next_id += 1
+        command_id = self._next_id()
         
-        command = {
-            "id": command_id,
-            "action": action,
-            "params": params
-        }
+        template = COMMAND_TEMPLATES.get(action)
+        if template is not None:
+            payload = template % (command_id, json_dumps(params))
+        else:
+            payload = json_dumps({
+                "id": command_id,
+                "action": action,
+                "params": params
+            })
         
-        print(f"Sending {action} command: {json.dumps(params)}")
+        log.debug("Sending %s command: %s", action, params)
         
         # Create a future to wait for the response
-        future = asyncio.Future()
-        pending_requests[command_id] = {
-            "future": future,
-            "description": description
-        }
+        future = asyncio.get_running_loop().create_future()
+        if self.interactive:
+            future.add_done_callback(
+                functools.partial(self._report_response, description or action)
+            )
+        self._pending[command_id] = future
         
-        # Send the command
-        await self.websocket.send(json.dumps(command))
-        
-        # Wait for the response
+        return command_id, payload, future
+    
+    async def send_command(self, action, params=None, description=None):
+        """Send a command to the VS Code MCP server"""
         try:
-            response = await asyncio.wait_for(future, timeout=10)
-            return response
+            return await self.request(action, params, description)
         except asyncio.TimeoutError:
             print("Timeout waiting for response")
-            del pending_requests[command_id]
             return None
     
+    async def request(self, action, params=None, description=None):
+        """Send a command and return its result
+        
+        Unlike send_command, a missing response raises asyncio.TimeoutError
+        instead of returning None.
+        """
+        command_id, payload, future = self._prepare_command(action, params, description)
+        
+        timer = None
+        try:
+            # Send the pre-encoded bytes as a text frame
+            await self.websocket.send(payload, text=True)
+            timer = self._start_timer(command_id)
+            
+            # Wait for the response
+            return await future
+        finally:
+            if timer is not None:
+                timer.cancel()
+            self._pending.pop(command_id, None)
+    
+    async def send_commands(self, specs):
+        """Send a batch of commands and wait for all of their responses
+        
+        Each spec is an (action, params) or (action, params, description)
+        tuple. Results are returned in order; a command that failed or timed
+        out yields its exception in place of a result.
+        """
+        prepared = []
+        timers = []
+        try:
+            # Register as we go so a spec that fails to encode still lets the
+            # finally block release the ones registered before it
+            for spec in specs:
+                prepared.append(self._prepare_command(*spec))
+            
+            # Send the whole batch before waiting on any response, and only
+            # then start the timeouts so sending does not eat into them
+            for _, payload, _ in prepared:
+                await self.websocket.send(payload, text=True)
+            timers = [self._start_timer(command_id) for command_id, _, _ in prepared]
+            
+            return await asyncio.gather(
+                *(future for _, _, future in prepared), return_exceptions=True
+            )
+        finally:
+            for timer in timers:
+                timer.cancel()
+            for command_id, _, _ in prepared:
+                self._pending.pop(command_id, None)
+    
     async def receive_messages(self):
         """Listen for messages from the server"""
+        recv = self.websocket.recv
+        handle_message = self.handle_message
         while True:
             try:
-                message = await self.websocket.recv()
-                await self.handle_message(message)
+                # Skip UTF-8 decoding/validation; json_loads accepts bytes
+                message = await recv(decode=False)
             except websockets.exceptions.ConnectionClosed:
                 print("Connection closed")
                 break
             except Exception as e:
                 print(f"Error receiving message: {e}")
                 break
+            handle_message(message)
     
-    async def handle_message(self, message):
-        """Handle incoming messages from the server"""
+    def handle_message(self, message):
+        """Handle incoming messages from the server
+        
+        This is a plain function so each frame is dispatched without another
+        coroutine hop. It also bounds the lifetime of a lazy simdjson document
+        to a single frame.
+        """
         try:
-            response = json.loads(message)
+            response = decode_response(message)
+            # Responses are JSON objects; other frames are ignored
+            if not isinstance(response, response_types):
+                return
             
-            if "id" in response and response["id"] in pending_requests:
-                request = pending_requests[response["id"]]
-                description = request["description"]
-                future = request["future"]
-                
-                del pending_requests[response["id"]]
-                
-                if "error" in response:
-                    print(f"❌ Error: {response['error']}")
-                    future.set_exception(Exception(response["error"]))
-                else:
-                    print(f"✅ Success: {description}")
-                    if isinstance(response.get("result"), dict):
-                        print(json.dumps(response["result"], indent=2))
-                    elif response.get("result") is not None:
-                        print(response["result"])
-                    future.set_result(response.get("result"))
-        except json.JSONDecodeError:
+            future = self._pending.pop(response.get("id"), None)
+            if future is None or future.done():
+                return
+            
+            if "error" in response:
+                future.set_exception(Exception(to_python(response["error"])))
+            else:
+                future.set_result(to_python(response.get("result")))
+        except ValueError:
             print(f"Failed to parse message: {message}")
         except Exception as e:
             print(f"Error handling message: {e}")
+    
+    def _report_response(self, description, future):
+        """Print the outcome of a completed request"""
+        # Cancelled requests print nothing; send_command reports timeouts itself
+        if future.cancelled():
+            return
+        error = future.exception()
+        if isinstance(error, asyncio.TimeoutError):
+            return
+        if error is not None:
+            log.error("❌ Error: %s", error)
+            return
+        
+        result = future.result()
+        log.info("✅ Success: %s", description)
+        if isinstance(result, dict):
+            compact = json_dumps(result)
+            if PRETTY_OUTPUT and len(compact) <= PRETTY_PRINT_LIMIT:
+                log.info("%s", json_pretty(result))
+            else:
+                log.info("%s", compact.decode("utf-8"))
+        elif result is not None:
+            log.info("%s", result)
+
+
+async def ainput(prompt=""):
+    """Read a line from stdin without blocking the event loop"""
+    return await asyncio.to_thread(input, prompt)
 
 
 async def show_menu(client):
@@ -151,25 +354,12 @@ async def show_menu(client):
         print("8. Run VS Code command")
         print("9. Exit")
         
-        choice = input("\nEnter command number: ")
+        choice = await ainput("\nEnter command number: ")
         
         try:
-            if choice == "1":
-                await open_file(client)
-            elif choice == "2":
-                await create_file(client)
-            elif choice == "3":
-                await get_file_content(client)
-            elif choice == "4":
-                await save_file(client)
-            elif choice == "5":
-                await close_file(client)
-            elif choice == "6":
-                await type_text(client)
-            elif choice == "7":
-                await type_text_at_position(client)
-            elif choice == "8":
-                await run_command(client)
+            handler = MENU_COMMANDS.get(choice)
+            if handler:
+                await handler(client)
             elif choice == "9":
                 print("Exiting...")
                 await client.close()
@@ -182,20 +372,20 @@ async def show_menu(client):
 
 async def open_file(client):
     """Command to open a file"""
-    path = input("Enter file path to open: ")
+    path = await ainput("Enter file path to open: ")
     await client.send_command("openFile", {"path": path}, f"Open file: {path}")
 
 
 async def create_file(client):
     """Command to create a new file"""
-    path = input("Enter file path to create: ")
-    content = input("Enter initial content (or press Enter for empty file): ")
+    path = await ainput("Enter file path to create: ")
+    content = await ainput("Enter initial content (or press Enter for empty file): ")
     await client.send_command("createFile", {"path": path, "content": content}, f"Create file: {path}")
 
 
 async def get_file_content(client):
     """Command to get file content"""
-    path = input("Enter file path (or press Enter for active file): ")
+    path = await ainput("Enter file path (or press Enter for active file): ")
     params = {"path": path} if path else {}
     await client.send_command("getFileContent", params, f"Get content of {path or 'active file'}")
 
@@ -207,20 +397,20 @@ async def save_file(client):
 
 async def close_file(client):
     """Command to close a file"""
-    path = input("Enter file path (or press Enter for active file): ")
+    path = await ainput("Enter file path (or press Enter for active file): ")
     params = {"path": path} if path else {}
     await client.send_command("closeFile", params, f"Close {path or 'active file'}")
 
 
 async def type_text(client):
     """Command to type text at cursor position"""
-    text = input("Enter text to type: ")
+    text = await ainput("Enter text to type: ")
     
     try:
-        speed = input("Typing speed (ms per char, default: 50): ")
+        speed = await ainput("Typing speed (ms per char, default: 50): ")
         speed = int(speed) if speed else 50
         
-        variation = input("Variation (0-1, default: 0.2): ")
+        variation = await ainput("Variation (0-1, default: 0.2): ")
         variation = float(variation) if variation else 0.2
         
         await client.send_command("type", {
@@ -235,11 +425,11 @@ async def type_text(client):
 
 async def type_text_at_position(client):
     """Command to type text at a specific position"""
-    text = input("Enter text to type: ")
+    text = await ainput("Enter text to type: ")
     
     try:
-        line = int(input("Line number: "))
-        character = int(input("Character position: "))
+        line = int(await ainput("Line number: "))
+        character = int(await ainput("Character position: "))
         
         await client.send_command("type", {
             "text": text,
@@ -252,8 +442,8 @@ async def type_text_at_position(client):
 
 async def run_command(client):
     """Command to run a VS Code command"""
-    command = input("Enter VS Code command to run: ")
-    args_str = input("Enter arguments as JSON (or press Enter for none): ")
+    command = await ainput("Enter VS Code command to run: ")
+    args_str = await ainput("Enter arguments as JSON (or press Enter for none): ")
     
     params = {"command": command}
     
@@ -267,24 +457,109 @@ async def run_command(client):
     await client.send_command("runCommand", params, f"Run command: {command}")
 
 
+# Menu choices mapped to their command handlers
+MENU_COMMANDS = {
+    "1": open_file,
+    "2": create_file,
+    "3": get_file_content,
+    "4": save_file,
+    "5": close_file,
+    "6": type_text,
+    "7": type_text_at_position,
+    "8": run_command
+}
+
+
+async def serve_daemon(client, path, receiver):
+    """Forward commands from a Unix socket over the client's connection
+    
+    Each line on the socket is a JSON object with "action", "params" and an
+    optional "id"; each reply is a JSON line with the same "id" and either
+    "result" or "error". Runs until the WebSocket connection closes.
+    """
+    # Writers of open socket connections, closed when the daemon shuts down
+    connections = set()
+    
+    async def handle_connection(reader, writer):
+        connections.add(writer)
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ValueError, asyncio.LimitOverrunError):
+                    # The line is over DAEMON_LINE_LIMIT and the framing of the
+                    # stream is lost, so reply once and end the connection
+                    writer.write(json_dumps({"id": None, "error": "Command line too long"}) + b"\n")
+                    await writer.drain()
+                    break
+                if not line:
+                    break
+                
+                request_id = None
+                try:
+                    request = json_loads(line)
+                    request_id = request.get("id")
+                    result = await client.request(request["action"], request.get("params"))
+                    reply = {"id": request_id, "result": result}
+                except Exception as e:
+                    reply = {"id": request_id, "error": str(e)}
+                writer.write(json_dumps(reply) + b"\n")
+                await writer.drain()
+        except (asyncio.CancelledError, ConnectionError):
+            # The daemon is shutting down or the socket client went away
+            pass
+        finally:
+            connections.discard(writer)
+            writer.close()
+    
+    server = await asyncio.start_unix_server(
+        handle_connection, path=path, limit=DAEMON_LINE_LIMIT
+    )
+    print(f"Forwarding commands from {path}")
+    try:
+        async with server:
+            try:
+                await receiver
+            finally:
+                # From Python 3.12, leaving the server context waits for every
+                # open connection, so close them rather than wait for clients
+                for writer in list(connections):
+                    writer.close()
+    finally:
+        # Python 3.13 already removes the socket file when the server closes
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(path)
+
+
 async def main():
     """Main entry point"""
     print(f"Connecting to VS Code MCP Server at {WS_URL}...")
     
-    client = VSCodeMCPClient(WS_URL)
+    client = VSCodeMCPClient(WS_URL, interactive=not args.daemon)
     if not await client.connect():
         return
     
     # Start listening for messages in the background
-    asyncio.create_task(client.receive_messages())
+    receiver = asyncio.create_task(client.receive_messages())
+    
+    if args.daemon:
+        await serve_daemon(client, args.daemon, receiver)
+        return
     
     # Show the menu and handle user input
     await show_menu(client)
 
 
 if __name__ == "__main__":
+    # Use uvloop's libuv-based event loop when it is installed
+    try:
+        import uvloop
+        run = uvloop.run
+    except ImportError:
+        run = asyncio.run
+
     try:
-        asyncio.run(main())
+        run(main())
     except KeyboardInterrupt:
         print("\nExiting...")
     except Exception as e: